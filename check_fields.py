@@ -9,24 +9,12 @@ import json
 
 load_dotenv()
 
-def get_access_token():
-    """Get access token using refresh token"""
-    token_url = f"https://accounts.zoho.{os.getenv('ZOHO_DATA_CENTER')}/oauth/v2/token"
-    
-    data = {
-        'refresh_token': os.getenv('ZOHO_REFRESH_TOKEN'),
-        'client_id': os.getenv('ZOHO_CLIENT_ID'),
-        'client_secret': os.getenv('ZOHO_CLIENT_SECRET'),
-        'grant_type': 'refresh_token'
-    }
-    
-    response = requests.post(token_url, data=data)
-    
-    if response.status_code == 200:
-        return response.json()['access_token']
-    else:
-        print(f"Failed to get access token: {response.text}")
-        return None
+from src.api.zoho_auth import get_access_token_sync
+
+# One session for the whole script — the token refresh, ticket list, and
+# ticket detail calls reuse a single keep-alive connection instead of paying
+# a fresh TCP+TLS handshake each.
+session = requests.Session()
 
 print("=" * 70)
 print("Verifying Custom Fields in Zoho Desk")
@@ -35,24 +23,23 @@ print()
 
 # Get access token
 print("1. Getting access token...")
-access_token = get_access_token()
+access_token = get_access_token_sync(session)
 if not access_token:
     exit(1)
 print("✓ Got access token")
 
-# Set up headers
+# Set up headers once on the session — every call below inherits them
 org_id = os.getenv('ZOHO_ORG_ID')
-headers = {
+session.headers.update({
     'Authorization': f'Zoho-oauthtoken {access_token}',
     'orgId': org_id
-}
+})
 base_url = os.getenv('ZOHO_BASE_URL')
 
 # Get a ticket to check custom fields
 print("\n2. Fetching recent tickets...")
-response = requests.get(
+response = session.get(
     f"{base_url}/tickets",
-    headers=headers,
     params={'limit': 1, 'sortBy': 'createdTime'}
 )
 
@@ -75,10 +62,7 @@ print(f"✓ Found ticket #{ticket_number} (ID: {ticket_id})")
 
 # Get full ticket details
 print(f"\n3. Getting ticket details...")
-response = requests.get(
-    f"{base_url}/tickets/{ticket_id}",
-    headers=headers
-)
+response = session.get(f"{base_url}/tickets/{ticket_id}")
 
 if response.status_code != 200:
     print(f"✗ Failed to get ticket details: {response.status_code}")
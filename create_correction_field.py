@@ -5,6 +5,8 @@ and feed corrections back into LLM training.
 """
 import asyncio
 import httpx
+import orjson
+from src.api.zoho_auth import get_access_token
 from src.config import get_settings
 
 settings = get_settings()
@@ -30,20 +32,11 @@ NEW_FIELD = {
 }
 
 
-async def get_access_token(client: httpx.AsyncClient) -> str:
-    """Get fresh access token via OAuth refresh flow"""
-    response = await client.post(
-        f"https://accounts.zoho.{settings.zoho_data_center}/oauth/v2/token",
-        data={
-            "refresh_token": settings.zoho_refresh_token,
-            "client_id": settings.zoho_client_id,
-            "client_secret": settings.zoho_client_secret,
-            "grant_type": "refresh_token"
-        }
-    )
-    if response.status_code == 200:
-        return response.json()["access_token"]
-    raise Exception(f"Token refresh failed: {response.text}")
+# apiName → allowed values, built by the same helper the main field script
+# uses so validation semantics stay in one place
+from create_custom_fields import build_picklist_index
+
+VALID_PICKLIST = build_picklist_index([NEW_FIELD])
 
 
 async def main():
@@ -51,7 +44,11 @@ async def main():
     print(f"Org ID: {settings.zoho_org_id}")
     print()
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16, keepalive_expiry=60.0),
+    ) as client:
         # Get fresh access token
         access_token = await get_access_token(client)
         headers = {
@@ -66,7 +63,7 @@ async def main():
             headers=headers
         )
         if existing_resp.status_code == 200:
-            existing = [f.get("apiName") for f in existing_resp.json().get("data", [])]
+            existing = [f.get("apiName") for f in orjson.loads(existing_resp.content).get("data", [])]
             if NEW_FIELD["apiName"] in existing:
                 print(f"⚠  Field '{NEW_FIELD['apiName']}' already exists — skipping.")
                 return
@@ -75,7 +72,7 @@ async def main():
         response = await client.post(
             f"{settings.zoho_base_url}/fields?module=tickets",
             headers=headers,
-            json=NEW_FIELD
+            content=orjson.dumps(NEW_FIELD)
         )
 
         if response.status_code in [200, 201]:
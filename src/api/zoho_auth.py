@@ -0,0 +1,152 @@
+"""
+Shared Zoho OAuth helper for the setup/debug scripts.
+
+Access tokens live ~1 hour, but every script used to burn a refresh-grant
+roundtrip per run. This caches the token in memory for the process and on
+disk across invocations (the same file check_fields.py reads), cutting
+~150-400 ms per run and keeping us far below Zoho's daily refresh cap.
+
+The FastAPI app keeps using ZohoDeskClient's class-level cache — this module
+is for the one-shot scripts that don't construct a client.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Optional, Tuple
+
+import httpx
+
+from src.config import get_settings
+
+TOKEN_CACHE_PATH = os.path.expanduser("~/.cache/parkm/zoho_token.json")
+REFRESH_BUFFER = 60  # seconds before expiry at which we refresh
+
+_access_token: Optional[str] = None
+_expires_at: float = 0.0
+_refresh_lock = asyncio.Lock()
+
+
+def _read_disk_cache(client_id: str) -> Optional[Tuple[str, float]]:
+    """Return (token, expiry_ts) from disk if minted by these credentials
+    and not about to expire; None otherwise."""
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            cached = json.load(f)
+        if cached['client_id'] == client_id and cached['expiry_ts'] - time.time() > REFRESH_BUFFER:
+            return cached['access_token'], cached['expiry_ts']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+    return None
+
+
+def _write_disk_cache(client_id: str, token: str, expiry_ts: float) -> None:
+    """Atomic write, 0600 — it's a bearer credential."""
+    os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+    tmp_path = TOKEN_CACHE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'access_token': token,
+            'client_id': client_id,
+            'expiry_ts': expiry_ts,
+        }, f)
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, TOKEN_CACHE_PATH)
+
+
+async def get_access_token(client: httpx.AsyncClient, retries: int = 5) -> str:
+    """Return a valid access token, refreshing only when needed.
+
+    Checks the in-process cache, then the disk cache, then POSTs the refresh
+    grant (with exponential backoff on 429/5xx). Concurrent callers share one
+    refresh via the lock instead of racing Zoho.
+    """
+    global _access_token, _expires_at
+    settings = get_settings()
+
+    if _access_token and time.time() < _expires_at - REFRESH_BUFFER:
+        return _access_token
+
+    cached = _read_disk_cache(settings.zoho_client_id)
+    if cached:
+        _access_token, _expires_at = cached
+        return _access_token
+
+    async with _refresh_lock:
+        # Another task may have refreshed while we waited
+        if _access_token and time.time() < _expires_at - REFRESH_BUFFER:
+            return _access_token
+
+        token_url = f"https://accounts.zoho.{settings.zoho_data_center}/oauth/v2/token"
+        data = {
+            "refresh_token": settings.zoho_refresh_token,
+            "client_id": settings.zoho_client_id,
+            "client_secret": settings.zoho_client_secret,
+            "grant_type": "refresh_token",
+        }
+
+        for attempt in range(retries):
+            response = await client.post(token_url, data=data)
+            if response.status_code == 200:
+                resp_data = response.json()
+                _access_token = resp_data["access_token"]
+                _expires_at = time.time() + resp_data.get("expires_in", 3600)
+                _write_disk_cache(settings.zoho_client_id, _access_token, _expires_at)
+                return _access_token
+            if response.status_code != 429 and response.status_code < 500:
+                break
+            if attempt < retries - 1:
+                wait = min(2 ** attempt, 30)
+                print(f"⚠  Token refresh retry {attempt+1}/{retries} after HTTP {response.status_code}; waiting {wait}s")
+                await asyncio.sleep(wait)
+
+        raise Exception(f"Token refresh failed: {response.text}")
+
+
+def get_access_token_sync(session, retries: int = 5) -> Optional[str]:
+    """Synchronous counterpart for the requests-based scripts.
+
+    Same cache file and semantics as get_access_token; `session` is any
+    object with a requests-style .post (a requests.Session).
+    """
+    settings = get_settings()
+
+    cached = _read_disk_cache(settings.zoho_client_id)
+    if cached:
+        return cached[0]
+
+    token_url = f"https://accounts.zoho.{settings.zoho_data_center}/oauth/v2/token"
+    data = {
+        "refresh_token": settings.zoho_refresh_token,
+        "client_id": settings.zoho_client_id,
+        "client_secret": settings.zoho_client_secret,
+        "grant_type": "refresh_token",
+    }
+
+    for attempt in range(retries):
+        response = session.post(token_url, data=data)
+        if response.status_code == 200:
+            resp_data = response.json()
+            token = resp_data["access_token"]
+            _write_disk_cache(settings.zoho_client_id, token, time.time() + resp_data.get("expires_in", 3600))
+            return token
+        if response.status_code != 429 and response.status_code < 500:
+            break
+        if attempt < retries - 1:
+            wait = min(2 ** attempt, 30)
+            print(f"⚠  Token refresh retry {attempt+1}/{retries} after HTTP {response.status_code}; waiting {wait}s")
+            time.sleep(wait)
+
+    print(f"Failed to get access token: {response.text}")
+    return None
+
+
+def invalidate() -> None:
+    """Drop the cached token (memory and disk) so the next call refreshes."""
+    global _access_token, _expires_at
+    _access_token = None
+    _expires_at = 0.0
+    try:
+        os.remove(TOKEN_CACHE_PATH)
+    except FileNotFoundError:
+        pass
@@ -167,9 +167,24 @@ def _extract_license_plate(subject: str, body: str) -> Optional[str]:
 class EmailClassifier:
     """Classifies support emails using AI"""
 
-    def __init__(self):
+    SYSTEM_PROMPT = (
+        "You are an expert customer support email classifier for ParkM, "
+        "a virtual parking permit provider. ParkM manages parking permits "
+        "for apartment communities. Emails come from three groups: "
+        "Customers (residents), Property managers/staff, and Sales reps. "
+        "Analyze support emails and classify them with one or more granular tags."
+    )
+
+    def __init__(self, http_client=None):
+        """
+        Args:
+            http_client: Optional httpx.Client to reuse an existing connection
+                pool (batch runs pass a shared pool so every classification
+                doesn't pay its own TLS handshake). Defaults to the OpenAI
+                SDK's own client.
+        """
         self.settings = get_settings()
-        self.client = OpenAI(api_key=self.settings.openai_api_key)
+        self.client = OpenAI(api_key=self.settings.openai_api_key, http_client=http_client)
         self.model = self.settings.ai_model
 
     def classify_email(self, subject: str, body: str, from_email: str = "", ticket_id: str = "", department_id: Optional[str] = None) -> Dict[str, Any]:
@@ -184,20 +199,8 @@ class EmailClassifier:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an expert customer support email classifier for ParkM, "
-                        "a virtual parking permit provider. ParkM manages parking permits "
-                        "for apartment communities. Emails come from three groups: "
-                        "Customers (residents), Property managers/staff, and Sales reps. "
-                        "Analyze support emails and classify them with one or more granular tags."
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
             ],
             response_format={"type": "json_object"},
             temperature=0.3
@@ -223,7 +226,134 @@ class EmailClassifier:
                 pass  # Never let logging break classification
 
         result = json.loads(response.choices[0].message.content)
+        return self._postprocess_result(result, subject, body)
+
+    def classify_batch(self, items: List[tuple], from_email: str = "", department_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Classify several emails in ONE LLM call.
+
+        Groups (subject, body) pairs into a single prompt that returns a JSON
+        array in the same order, amortizing the request overhead and the large
+        tag-catalog prefill across the whole group. Items whose entry comes
+        back missing or malformed get an {"error": ...} dict, so a partial
+        failure never sinks the rest of the batch.
+        """
+        prompt = self._build_batch_prompt(items, from_email, department_id=department_id)
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3
+        )
+
+        usage = response.usage
+        if usage:
+            try:
+                from src.services.analytics_logger import log_api_usage, estimate_openai_cost
+                cost = estimate_openai_cost(self.model, usage.prompt_tokens, usage.completion_tokens)
+                log_api_usage(
+                    provider="openai",
+                    call_type="classify_batch",
+                    model=self.model,
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
+                    total_tokens=usage.total_tokens,
+                    estimated_cost_usd=cost,
+                )
+            except Exception:
+                pass  # Never let logging break classification
+
+        parsed = json.loads(response.choices[0].message.content)
+        raw_results = parsed.get("results", []) if isinstance(parsed, dict) else parsed
 
+        results = []
+        for i, (subject, body) in enumerate(items):
+            entry = raw_results[i] if i < len(raw_results) else None
+            if not isinstance(entry, dict):
+                results.append({"error": f"missing or malformed result for item {i} in batch response"})
+                continue
+            results.append(self._postprocess_result(entry, subject, body))
+        return results
+
+    def classify_batch_api(self, items: List[tuple], poll_interval: float = 30.0, timeout: float = 86400.0) -> List[Dict[str, Any]]:
+        """
+        Classify emails through OpenAI's asynchronous Batch API.
+
+        Uploads one JSONL request per email keyed by custom_id (the item
+        index), creates a /v1/batches job, polls until it finishes, and
+        re-keys the output back into input order. Batch jobs are billed at
+        half price but take minutes to hours — this path is for offline
+        backfills where cost matters more than latency. Per-item failures
+        come back as {"error": ...} dicts.
+        """
+        lines = []
+        for i, (subject, body) in enumerate(items):
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": self.SYSTEM_PROMPT},
+                        {"role": "user", "content": self._build_classification_prompt(subject, body)},
+                    ],
+                    "response_format": {"type": "json_object"},
+                    "temperature": 0.3,
+                },
+            }))
+
+        batch_file = self.client.files.create(
+            file=("classify_batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch",
+        )
+        job = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted classification batch {job.id} ({len(items)} emails)")
+
+        deadline = time.time() + timeout
+        while job.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() > deadline:
+                raise TimeoutError(f"Batch {job.id} still '{job.status}' after {timeout:.0f}s")
+            time.sleep(poll_interval)
+            job = self.client.batches.retrieve(job.id)
+
+        if job.status != "completed":
+            raise Exception(f"Batch {job.id} ended with status '{job.status}'")
+
+        output = self.client.files.content(job.output_file_id).text
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            custom_id = rec.get("custom_id", "")
+            try:
+                content = rec["response"]["body"]["choices"][0]["message"]["content"]
+                by_id[custom_id] = json.loads(content)
+            except Exception as e:
+                by_id[custom_id] = {"error": f"batch item failed: {e}"}
+
+        results = []
+        for i, (subject, body) in enumerate(items):
+            entry = by_id.get(str(i))
+            if not isinstance(entry, dict):
+                results.append({"error": f"missing batch output for item {i}"})
+            elif "error" in entry:
+                results.append(entry)
+            else:
+                results.append(self._postprocess_result(entry, subject, body))
+        return results
+
+    def _postprocess_result(self, result: Dict[str, Any], subject: str, body: str) -> Dict[str, Any]:
+        """Validate tags and backfill entities on a raw LLM classification."""
         # Validate tags against allowed values
         raw_tags = result.get("tags", [])
         if isinstance(raw_tags, str):
@@ -250,7 +380,6 @@ class EmailClassifier:
     def _build_classification_prompt(self, subject: str, body: str, from_email: str = "", department_id: Optional[str] = None) -> str:
         """Build the classification prompt with granular tags"""
         email_line = f"\nFrom: {from_email}" if from_email else ""
-        LIVE_LEARNING_BLOCK = _build_live_learning_block(department_id)
         return f"""Analyze this customer support email and classify it.
 
 EMAIL:{email_line}
@@ -259,7 +388,29 @@ Body: {body}
 
 Provide your classification in JSON format with these fields:
 
-1. "tags" - A JSON array of one or more tags that apply. Choose from EXACTLY these values:
+{self._classification_instructions(department_id)}"""
+
+    def _build_batch_prompt(self, items: List[tuple], from_email: str = "", department_id: Optional[str] = None) -> str:
+        """Build a prompt classifying several emails in one request."""
+        email_line = f"\nFrom: {from_email}" if from_email else ""
+        emails_block = "\n\n".join(
+            f"[{i}]{email_line}\nSubject: {subject}\nBody: {body}"
+            for i, (subject, body) in enumerate(items)
+        )
+        return f"""Analyze each of the following {len(items)} customer support emails and classify every one of them independently.
+
+EMAILS:
+
+{emails_block}
+
+Respond with a JSON object of the form {{"results": [...]}} where "results" contains exactly {len(items)} classifications, one per email, in the same order as the emails above. Classify each email in JSON format with these fields:
+
+{self._classification_instructions(department_id)}"""
+
+    def _classification_instructions(self, department_id: Optional[str] = None) -> str:
+        """The shared tag catalog, rules, and output-format instructions."""
+        LIVE_LEARNING_BLOCK = _build_live_learning_block(department_id)
+        return f"""1. "tags" - A JSON array of one or more tags that apply. Choose from EXACTLY these values:
 
    CUSTOMER TAGS (resident/end-user emails):
    - "Customer Canceling a Permit and Refunding" — wants to cancel AND get money back